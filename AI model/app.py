@@ -14,7 +14,10 @@ try:
         predict_relevance,
         model,  # Import the singleton model instance
         tokenizer,  # Import the singleton tokenizer instance
-        dataset_path
+        dataset_path,
+        LOW_MEMORY,
+        memory_report,
+        memory_usage
     )
 except Exception as e:
     print(f"Fatal error: Could not load model: {str(e)}")
@@ -27,12 +30,29 @@ print(f"\nAPI Server Info:")
 print(f"Model path: {os.path.abspath(model.model_path)}")
 print(f"Dataset path: {dataset_path}")
 print(f"Model type: {type(model).__name__}")
-print(f"Tokenizer type: {type(tokenizer).__name__}\n")
+print(f"Tokenizer type: {type(tokenizer).__name__}")
+print(f"Low-memory mode: {LOW_MEMORY}")
+print(f"Weights dtype: {next(model.parameters()).dtype}\n")
 
 @app.route('/', methods=['GET'])
 def home():
     return jsonify({"message": "Welcome to the relevance prediction API"})
 
+@app.route('/memory', methods=['GET'])
+def memory():
+    """Memory of this worker (RSS, PSS, USS in MB), at startup and now"""
+    pid = os.getpid()
+    return jsonify({
+        "pid": pid,
+        "low_memory": LOW_MEMORY,
+        "dtype": str(next(model.parameters()).dtype),
+        "current": memory_usage(),
+        # Stages this worker measured itself
+        "startup": [entry for entry in memory_report if entry["pid"] == pid],
+        # Stages measured by a parent that loaded the model before forking
+        "inherited_startup": [entry for entry in memory_report if entry["pid"] != pid]
+    })
+
 @app.route('/predict', methods=['POST'])
 def predict():
     data = request.get_json()
@@ -90,4 +110,5 @@ def test():
     return jsonify(results)
 
 if __name__ == '__main__':
-    app.run(debug=True)
+    # The debug reloader runs a second copy of the model in a child process
+    app.run(debug=True, use_reloader=not LOW_MEMORY)
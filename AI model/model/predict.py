@@ -1,17 +1,172 @@
 import torch
-from transformers import AutoTokenizer, AutoModelForSequenceClassification
-import spacy
-from gensim.models import Word2Vec
-import pandas as pd
-from sklearn.feature_extraction.text import TfidfVectorizer
-from collections import defaultdict
+from transformers import AutoTokenizer
+import contextlib
+import json
 import os
+import subprocess
+import sys
+import time
+
+try:
+    from model.topic_terms import generate_topic_terms, load_topic_terms
+    from model.reduce_precision import (
+        CHECK_FILE, current_build, describe, load_mapped_model, load_model,
+        precision_problem, torch_dtype
+    )
+except ImportError:  # Running predict.py directly from the model folder
+    from topic_terms import generate_topic_terms, load_topic_terms
+    from reduce_precision import (
+        CHECK_FILE, current_build, describe, load_mapped_model, load_model,
+        precision_problem, torch_dtype
+    )
+
+# Low-memory serving mode: reduced-precision weights and a topic terms table,
+# each built once in a separate process and shared between workers through mmap
+LOW_MEMORY = os.environ.get("QNA_LOW_MEMORY", "0").lower() in ("1", "true", "yes")
+MODEL_DTYPE = os.environ.get("QNA_MODEL_DTYPE", "bfloat16" if LOW_MEMORY else "float32")
+TOPIC_TERMS_PATH = os.environ.get(
+    "QNA_TOPIC_TERMS_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "topic_terms.bin")
+)
+
+# Checks a reduced-precision model must pass against float32 before it is used
+PRECISION_SAMPLES = int(os.environ.get("QNA_PRECISION_SAMPLES", "256"))
+DTYPE_TOLERANCE = float(os.environ.get("QNA_DTYPE_TOLERANCE", "0.02"))  # Max score drift
+DTYPE_MAX_FLIPS = int(os.environ.get("QNA_DTYPE_MAX_FLIPS", "0"))  # Decisions changed at 0.5
+DTYPE_MAX_SLOWDOWN = float(os.environ.get("QNA_DTYPE_MAX_SLOWDOWN", "1.5"))
 
 # Global variables for singleton pattern
 _model = None
 _tokenizer = None
 _topic_terms_cache = None
 
+# Memory recorded at each startup stage, tagged with the pid that measured it
+memory_report = []
+
+def memory_usage() -> dict:
+    """
+    RSS, PSS and USS of this process in MB.
+
+    RSS counts pages shared with other workers in full; PSS splits them
+    between the processes sharing them and USS leaves them out, so PSS/USS
+    show what each extra worker really costs. Values the platform cannot
+    report are None.
+    """
+    usage = {"rss_mb": None, "pss_mb": None, "uss_mb": None}
+    try:
+        fields = {}
+        with open("/proc/self/smaps_rollup") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) == 3 and parts[2] == "kB":
+                    fields[parts[0].rstrip(":")] = int(parts[1]) / 1024
+        usage["rss_mb"] = fields["Rss"]
+        usage["pss_mb"] = fields["Pss"]
+        usage["uss_mb"] = fields["Private_Clean"] + fields["Private_Dirty"]
+    except (OSError, KeyError):
+        try:
+            import psutil
+            info = psutil.Process().memory_full_info()
+            usage["rss_mb"] = info.rss / (1024 * 1024)
+            usage["uss_mb"] = info.uss / (1024 * 1024)
+            if hasattr(info, "pss"):
+                usage["pss_mb"] = info.pss / (1024 * 1024)
+        except ImportError:
+            if sys.platform != "win32":
+                # Peak RSS only (KB on Linux, bytes on macOS)
+                import resource
+                peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+                usage["rss_mb"] = peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    return {key: None if value is None else round(value, 1) for key, value in usage.items()}
+
+def record_memory(stage: str):
+    usage = memory_usage()
+    memory_report.append({"pid": os.getpid(), "stage": stage, **usage})
+    print(f"Memory {stage} (pid {os.getpid()}): RSS {usage['rss_mb']} MB, "
+          f"PSS {usage['pss_mb']} MB, USS {usage['uss_mb']} MB")
+
+@contextlib.contextmanager
+def _build_lock(path):
+    """Exclusive lock on path + ".lock", so only one worker runs a build"""
+    with open(f"{path}.lock", "a+b") as f:
+        if sys.platform == "win32":
+            import msvcrt
+            while True:
+                try:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+                    break
+                except OSError:
+                    time.sleep(1)  # Another worker is building
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+def _build_once(path, is_stale, command):
+    """
+    Run command if is_stale() says the output at path needs (re)building.
+    Staleness is checked again under the lock, so workers that start
+    together wait for the first build instead of repeating it.
+    """
+    if not is_stale():
+        return
+    with _build_lock(path):
+        if is_stale():
+            print(f"Building {path}")
+            subprocess.run([sys.executable] + command, check=True)
+
+def _newest_mtime(directory):
+    return max(os.path.getmtime(os.path.join(directory, name)) for name in os.listdir(directory))
+
+def _load_serving_model(model_path):
+    """
+    Load the model in MODEL_DTYPE if its saved precision check passes,
+    otherwise in float32. Returns the model and the path it was loaded from.
+
+    The reduced copy and its check are built once, in a child process, and
+    saved next to the original model. Workers map the saved weights from
+    disk, so they share one copy of them in the page cache.
+    """
+    dtype = torch_dtype(MODEL_DTYPE)
+    if dtype == torch.float32:
+        return load_model(model_path), model_path
+
+    reduced_path = f"{model_path}_{MODEL_DTYPE}"
+
+    def is_stale():
+        build = current_build(reduced_path)
+        check_path = os.path.join(build, CHECK_FILE) if build else None
+        if not check_path or not os.path.exists(check_path):
+            return True
+        if os.path.getmtime(check_path) < _newest_mtime(model_path):
+            return True
+        with open(check_path) as f:
+            return json.load(f).get("requested_samples") != PRECISION_SAMPLES
+
+    builder = os.path.join(os.path.dirname(os.path.abspath(__file__)), "reduce_precision.py")
+    _build_once(reduced_path, is_stale, [builder, model_path, dataset_path, reduced_path,
+                                         MODEL_DTYPE, str(PRECISION_SAMPLES)])
+
+    build = current_build(reduced_path)
+    with open(os.path.join(build, CHECK_FILE)) as f:
+        check = json.load(f)
+    print(describe(check))
+    reason = precision_problem(check, DTYPE_TOLERANCE, DTYPE_MAX_FLIPS, DTYPE_MAX_SLOWDOWN)
+    if reason:
+        print(f"Not using {MODEL_DTYPE}: {reason}, using float32")
+        return load_model(model_path), model_path
+    print(f"Serving {MODEL_DTYPE} weights")
+    return load_mapped_model(build, dtype), build
+
 def get_model():
     """Singleton pattern for model"""
     global _model
@@ -25,16 +180,7 @@ def get_model():
                 raise FileNotFoundError(f"Model not found in {model_path}")
             
             # Load model with specific configuration
-            _model = AutoModelForSequenceClassification.from_pretrained(
-                model_path,
-                local_files_only=True,  # Only use local files
-                config={
-                    "architectures": ["DistilBertForSequenceClassification"],
-                    "model_type": "distilbert",
-                    "num_labels": 2
-                }
-            )
-            _model.eval()  # Set to evaluation mode
+            _model, model_path = _load_serving_model(model_path)
             # Store the path as an attribute
             _model.model_path = model_path
             print(f"Loaded model from {os.path.abspath(model_path)}")
@@ -73,10 +219,14 @@ try:
     current_dir = os.path.dirname(os.path.abspath(__file__))
     dataset_path = os.path.join(current_dir, "..", "utils", "dataset.csv")
     
+    record_memory("before model load")
+    
     # Initialize model and tokenizer
     model = get_model()
     tokenizer = get_tokenizer()
     
+    record_memory("after model load")
+    
     print(f"\nInitialization Info:")
     print(f"Model path: {os.path.abspath(model.model_path)}")  # Use model_path attribute
     print(f"Dataset path: {os.path.abspath(dataset_path)}")
@@ -85,79 +235,42 @@ except Exception as e:
     print(f"Fatal error loading model/tokenizer: {str(e)}")
     raise  # Stop execution if model can't be loaded
 
-def generate_topic_terms(dataset_path, num_terms=10):
+def _load_shared_topic_terms(dataset_path):
     """
-    Automatically generate relevant terms for each topic using NLP techniques
+    Map the topic terms table, building it first in a child process if it is
+    missing or older than the dataset. The build needs spaCy, pandas and
+    scikit-learn; running it out of process keeps them out of this worker.
     """
-    # Load the English language model
-    nlp = spacy.load('en_core_web_sm')
-    
-    # Read the dataset
-    df = pd.read_csv(dataset_path)
-    
-    # Group questions by topic
-    topic_questions = defaultdict(list)
-    for _, row in df.iterrows():
-        if row['relevant'] == 1:  # Only use relevant questions for term extraction
-            # Add both question and topic text for better term extraction
-            topic_questions[row['topic']].append(row['question'].lower())
-            topic_questions[row['topic']].append(row['topic'].lower())
-    
-    # Initialize topic terms dictionary
-    topic_terms = defaultdict(set)
-    
-    for topic, questions in topic_questions.items():
-        # 1. Extract terms using TF-IDF with better parameters
-        tfidf = TfidfVectorizer(
-            stop_words='english', 
-            ngram_range=(1, 3),  # Allow longer phrases
-            min_df=1,  # Include all terms
-            max_features=50  # Get more terms
-        )
-        tfidf_matrix = tfidf.fit_transform(questions)
-        feature_names = tfidf.get_feature_names_out()
-        
-        # Get top TF-IDF terms
-        for question_idx in range(len(questions)):
-            scores = zip(feature_names, tfidf_matrix[question_idx].toarray()[0])
-            sorted_scores = sorted(scores, key=lambda x: x[1], reverse=True)
-            topic_terms[topic].update([term for term, score in sorted_scores[:10]])
-        
-        # 2. Extract key phrases using spaCy
-        doc = nlp(' '.join(questions))
-        for chunk in doc.noun_chunks:
-            if len(chunk.text.split()) <= 3:  # Limit phrase length
-                topic_terms[topic].add(chunk.text.lower())
-        
-        # 3. Add individual words from topic name
-        topic_words = set(word.lower() for word in topic.split() 
-                         if len(word) > 2 and word.lower() not in nlp.Defaults.stop_words)
-        topic_terms[topic].update(topic_words)
-        
-        # 4. Add key terms from questions
-        for question in questions:
-            doc = nlp(question)
-            for token in doc:
-                # Add nouns and technical terms
-                if (token.pos_ in ['NOUN', 'PROPN'] and 
-                    len(token.text) > 2 and 
-                    token.text.lower() not in nlp.Defaults.stop_words):
-                    topic_terms[topic].add(token.text.lower())
-    
-    return dict(topic_terms)
+    def is_stale():
+        return (not os.path.exists(TOPIC_TERMS_PATH) or
+                os.path.getmtime(TOPIC_TERMS_PATH) < os.path.getmtime(dataset_path))
+
+    builder = os.path.join(os.path.dirname(os.path.abspath(__file__)), "topic_terms.py")
+    _build_once(TOPIC_TERMS_PATH, is_stale, [builder, dataset_path, TOPIC_TERMS_PATH])
+    return load_topic_terms(TOPIC_TERMS_PATH)
 
 def get_topic_terms(dataset_path):
     global _topic_terms_cache
     if _topic_terms_cache is None:
-        _topic_terms_cache = generate_topic_terms(dataset_path)
+        if LOW_MEMORY:
+            _topic_terms_cache = _load_shared_topic_terms(dataset_path)
+        else:
+            _topic_terms_cache = generate_topic_terms(dataset_path)
     return _topic_terms_cache
 
+if LOW_MEMORY:
+    # Map the table at startup so the first request does not pay for it
+    get_topic_terms(dataset_path)
+    record_memory("after topic terms")
+
 def calculate_similarity(question: str, terms: set) -> float:
     """
     Enhanced similarity calculation with better term matching
     """
     question = question.lower()
     question_words = set(question.split())
+    # Decode a shared TermSet once per call instead of once per pass below
+    terms = list(terms)
     
     # Special handling for "What is X?" questions
     if question.startswith('what is '):
@@ -239,7 +352,7 @@ def predict_relevance(question: str, topic: str) -> float:
     # Get model prediction
     with torch.no_grad():
         outputs = model(**inputs)
-        probabilities = torch.softmax(outputs.logits, dim=1)
+        probabilities = torch.softmax(outputs.logits.float(), dim=1)
         model_score = probabilities[0][1].item()
         print(f"Initial model score: {model_score}")
     
@@ -0,0 +1,213 @@
+import csv
+import gc
+import glob
+import json
+import math
+import mmap
+import os
+import shutil
+import sys
+import time
+import numpy as np
+import torch
+from transformers import AutoConfig, AutoTokenizer, AutoModelForSequenceClassification
+
+CHECK_FILE = "precision_check.json"
+SUPPORTED_DTYPES = ("float32", "float16", "bfloat16")
+
+_SAFETENSORS_DTYPES = {"F32": torch.float32, "F16": torch.float16, "BF16": torch.bfloat16}
+
+
+def torch_dtype(dtype_name):
+    if dtype_name not in SUPPORTED_DTYPES:
+        raise ValueError(f"Unsupported dtype {dtype_name!r}, expected one of {', '.join(SUPPORTED_DTYPES)}")
+    return getattr(torch, dtype_name)
+
+
+def load_model(model_path, dtype=torch.float32):
+    model = AutoModelForSequenceClassification.from_pretrained(
+        model_path,
+        local_files_only=True,  # Only use local files
+        torch_dtype=dtype,
+        config={
+            "architectures": ["DistilBertForSequenceClassification"],
+            "model_type": "distilbert",
+            "num_labels": 2
+        }
+    )
+    model.eval()  # Set to evaluation mode
+    return model
+
+
+def validation_rows(dataset_path, limit):
+    """
+    Rows of the validation split used by train.py (train_test_split with
+    test_size=0.2, random_state=42), so the model never trained on them
+    """
+    if limit <= 0:
+        return []
+    with open(dataset_path, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    n_val = math.ceil(0.2 * len(rows))
+    val_idx = np.random.RandomState(42).permutation(len(rows))[:n_val]
+    return [(rows[i]["question"], rows[i]["topic"]) for i in val_idx[:limit]]
+
+
+def probe_scores(model, tokenizer, samples, batch_size=8):
+    """Model relevance scores for (question, topic) samples"""
+    texts = [f"Question: {question.lower().rstrip('?.!')} Topic: {topic}"
+             for question, topic in samples]
+    scores = []
+    for i in range(0, len(texts), batch_size):
+        inputs = tokenizer(
+            texts[i:i + batch_size],
+            padding="max_length",
+            truncation=True,
+            max_length=128,
+            return_tensors="pt",
+            return_token_type_ids=False
+        )
+        with torch.no_grad():
+            logits = model(**inputs).logits.float()
+        scores.extend(torch.softmax(logits, dim=1)[:, 1].tolist())
+    return scores
+
+
+def _timed_probe(model, tokenizer, samples):
+    probe_scores(model, tokenizer, samples[:1])  # Warm up kernels for this dtype
+    start = time.perf_counter()
+    scores = probe_scores(model, tokenizer, samples)
+    return scores, time.perf_counter() - start
+
+
+def load_mapped_model(model_dir, dtype):
+    """
+    Load a saved model with every weight backed by a copy-on-write mmap of
+    its model.safetensors file.
+
+    The pages come from the page cache, so workers on one node that load the
+    same file share a single copy of the weights (it shows in PSS, not RSS).
+    """
+    with open(os.path.join(model_dir, "model.safetensors"), "rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+    header_size = int.from_bytes(mm[:8], "little")
+    header = json.loads(mm[8:8 + header_size])
+    data = torch.frombuffer(mm, dtype=torch.uint8)  # Keeps mm alive
+    base = 8 + header_size
+
+    model = AutoModelForSequenceClassification.from_config(
+        AutoConfig.from_pretrained(model_dir, local_files_only=True), torch_dtype=dtype
+    )
+    expected = set(model.state_dict())
+    for name, info in header.items():
+        if name == "__metadata__":
+            continue
+        start, end = info["data_offsets"]
+        tensor = data[base + start:base + end].view(_SAFETENSORS_DTYPES[info["dtype"]]).reshape(info["shape"])
+        module_name, _, leaf = name.rpartition(".")
+        module = model.get_submodule(module_name)
+        if leaf in module._parameters:
+            module._parameters[leaf] = torch.nn.Parameter(tensor, requires_grad=False)
+        else:
+            module._buffers[leaf] = tensor
+        expected.discard(name)
+    if expected:
+        raise ValueError(f"{model_dir} is missing weights: {', '.join(sorted(expected))}")
+    model.eval()
+    return model
+
+
+def current_build(out_path):
+    """Directory of the build out_path currently points to, or None"""
+    try:
+        with open(f"{out_path}.current") as f:
+            return os.path.join(os.path.dirname(out_path), f.read().strip())
+    except FileNotFoundError:
+        return None
+
+
+def build_reduced_model(model_path, dataset_path, out_path, dtype_name, samples=256):
+    """
+    Save a reduced-precision copy of the model together with how it compares
+    to float32 on validation rows: score drift, decisions flipped at the 0.5
+    threshold and inference time.
+
+    Each build goes to its own versioned directory, and out_path.current is
+    switched to it atomically, so a worker reading the previous build is
+    never left with a half-written or deleted one.
+    """
+    dtype = torch_dtype(dtype_name)
+    rows = validation_rows(dataset_path, samples)
+    version = f"{os.path.basename(out_path)}-{time.strftime('%Y%m%d%H%M%S')}-{os.getpid()}"
+    build_dir = os.path.join(os.path.dirname(out_path), version)
+    os.makedirs(build_dir)
+
+    check = {"dtype": dtype_name, "requested_samples": samples, "samples": len(rows)}
+    if not rows:
+        check["error"] = "no validation rows to compare against float32"
+    else:
+        tokenizer = AutoTokenizer.from_pretrained(model_path, local_files_only=True)
+        model = load_model(model_path)
+        reference, reference_time = _timed_probe(model, tokenizer, rows)
+        del model
+        gc.collect()
+
+        try:
+            model = load_model(model_path, dtype)
+            reduced, reduced_time = _timed_probe(model, tokenizer, rows)
+        except Exception as e:
+            check["error"] = f"inference not supported here ({str(e)})"
+        else:
+            check.update({
+                "max_drift": max(abs(a - b) for a, b in zip(reference, reduced)),
+                "flips": sum((a >= 0.5) != (b >= 0.5) for a, b in zip(reference, reduced)),
+                "float32_seconds": reference_time,
+                "reduced_seconds": reduced_time
+            })
+            model.save_pretrained(build_dir)
+
+    with open(os.path.join(build_dir, CHECK_FILE), "w") as f:
+        json.dump(check, f, indent=2)
+
+    previous = current_build(out_path)
+    pointer_tmp = f"{out_path}.current.{os.getpid()}.tmp"
+    with open(pointer_tmp, "w") as f:
+        f.write(version)
+    os.replace(pointer_tmp, f"{out_path}.current")
+
+    # Keep the previous build, which a starting worker may still be loading
+    for old_dir in glob.glob(f"{glob.escape(out_path)}-*"):
+        if old_dir not in (build_dir, previous):
+            shutil.rmtree(old_dir, ignore_errors=True)  # Mapped files can't be removed on Windows
+    return check
+
+
+def precision_problem(check, tolerance, max_flips, max_slowdown):
+    """Why a saved check rules out the reduced model, or None if it passed"""
+    if "error" in check:
+        return check["error"]
+    slowdown = check["reduced_seconds"] / check["float32_seconds"]
+    if check["max_drift"] > tolerance:
+        return f"score drift {check['max_drift']:.4f} exceeds {tolerance}"
+    if check["flips"] > max_flips:
+        return f"{check['flips']} decision flips exceed {max_flips}"
+    if slowdown > max_slowdown:
+        return f"{slowdown:.2f}x slower than float32 (limit {max_slowdown}x)"
+    return None
+
+
+def describe(check):
+    if "error" in check:
+        return f"{check['dtype']} failed on this machine: {check['error']}"
+    return (f"{check['dtype']} vs float32 on {check['samples']} validation rows: "
+            f"max score drift {check['max_drift']:.4f}, decision flips {check['flips']}, "
+            f"time {check['reduced_seconds']:.2f}s vs {check['float32_seconds']:.2f}s")
+
+
+if __name__ == "__main__":
+    # Build step for low-memory serving:
+    # python reduce_precision.py MODEL_DIR DATASET_CSV OUTPUT_PATH DTYPE [SAMPLES]
+    if len(sys.argv) not in (5, 6):
+        sys.exit("usage: python reduce_precision.py MODEL_DIR DATASET_CSV OUTPUT_PATH DTYPE [SAMPLES]")
+    samples = int(sys.argv[5]) if len(sys.argv) == 6 else 256
+    print(describe(build_reduced_model(*sys.argv[1:5], samples=samples)))
@@ -1,3 +1,309 @@
-# Add your topic terms related functionality here
-def your_function():
-    pass 
\ No newline at end of file
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections import defaultdict
+from collections.abc import Mapping
+
+# File layout: header, then uint32 sections (term offsets, term ids, topic
+# spans, topic name offsets), then the term and topic name UTF-8 blobs
+_MAGIC = b'QNATT1' + (b'L' if sys.byteorder == 'little' else b'B') + b'\0'
+_HEADER = struct.Struct('<8s3I')
+
+
+def generate_topic_terms(dataset_path, num_terms=10):
+    """
+    Automatically generate relevant terms for each topic using NLP techniques
+    """
+    # Build-time only dependencies, imported here so loading a saved table
+    # never pulls them into the serving process
+    import spacy
+    import pandas as pd
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    # Load the English language model
+    nlp = spacy.load('en_core_web_sm')
+
+    # Read the dataset
+    df = pd.read_csv(dataset_path)
+
+    # Group questions by topic
+    topic_questions = defaultdict(list)
+    for _, row in df.iterrows():
+        if row['relevant'] == 1:  # Only use relevant questions for term extraction
+            # Add both question and topic text for better term extraction
+            topic_questions[row['topic']].append(row['question'].lower())
+            topic_questions[row['topic']].append(row['topic'].lower())
+    del df
+
+    # Initialize topic terms dictionary
+    topic_terms = defaultdict(set)
+
+    for topic, questions in topic_questions.items():
+        # 1. Extract terms using TF-IDF with better parameters
+        tfidf = TfidfVectorizer(
+            stop_words='english',
+            ngram_range=(1, 3),  # Allow longer phrases
+            min_df=1,  # Include all terms
+            max_features=50  # Get more terms
+        )
+        tfidf_matrix = tfidf.fit_transform(questions)
+        feature_names = tfidf.get_feature_names_out()
+
+        # Get top TF-IDF terms
+        for question_idx in range(len(questions)):
+            scores = zip(feature_names, tfidf_matrix[question_idx].toarray()[0])
+            sorted_scores = sorted(scores, key=lambda x: x[1], reverse=True)
+            topic_terms[topic].update([term for term, score in sorted_scores[:10]])
+        del tfidf, tfidf_matrix
+
+        # 2. Extract key phrases using spaCy
+        doc = nlp(' '.join(questions))
+        for chunk in doc.noun_chunks:
+            if len(chunk.text.split()) <= 3:  # Limit phrase length
+                topic_terms[topic].add(chunk.text.lower())
+
+        # 3. Add individual words from topic name
+        topic_words = set(word.lower() for word in topic.split()
+                         if len(word) > 2 and word.lower() not in nlp.Defaults.stop_words)
+        topic_terms[topic].update(topic_words)
+
+        # 4. Add key terms from questions
+        for question in questions:
+            doc = nlp(question)
+            for token in doc:
+                # Add nouns and technical terms
+                if (token.pos_ in ['NOUN', 'PROPN'] and
+                    len(token.text) > 2 and
+                    token.text.lower() not in nlp.Defaults.stop_words):
+                    topic_terms[topic].add(token.text.lower())
+
+    return dict(topic_terms)
+
+
+def _uint32s(data) -> memoryview:
+    """Read-only uint32 view over a bytes-like buffer"""
+    return memoryview(data).toreadonly().cast('B').cast('I')
+
+
+class TermPool:
+    """
+    Store of unique topic terms packed into a single UTF-8 blob.
+
+    The blob may be bytes or a read-only mmap; term ids follow the byte order
+    of the encoded terms so lookups can bisect.
+    """
+    __slots__ = ('_blob', '_offsets', '_base')
+
+    def __init__(self, blob, offsets: memoryview, base: int = 0):
+        self._blob = blob
+        self._offsets = offsets
+        self._base = base
+
+    @classmethod
+    def from_terms(cls, terms):
+        encoded = sorted(set(term.encode('utf-8') for term in terms))
+        offsets = array('I', [0])
+        for term in encoded:
+            offsets.append(offsets[-1] + len(term))
+        return cls(b''.join(encoded), _uint32s(offsets))
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __reduce__(self):
+        blob = self._blob[self._base:self._base + self._offsets[-1]]
+        return (_restore_pool, (blob, self._offsets.tobytes()))
+
+    def raw(self, term_id: int) -> bytes:
+        return self._blob[self._base + self._offsets[term_id]:
+                          self._base + self._offsets[term_id + 1]]
+
+    def term(self, term_id: int) -> str:
+        return self.raw(term_id).decode('utf-8')
+
+    def lookup(self, term: str) -> int:
+        """Return the id of term, or -1 if it is not in the pool"""
+        target = term.encode('utf-8')
+        lo, hi = 0, len(self)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.raw(mid) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < len(self) and self.raw(lo) == target:
+            return lo
+        return -1
+
+
+def _restore_pool(blob, offsets):
+    return TermPool(blob, _uint32s(offsets))
+
+
+class TermSet:
+    """
+    Read-only set-like view over the sorted term ids of one topic.
+
+    Terms are decoded on every iteration and not cached, so the only lasting
+    copy of them is the shared table; callers that make several passes
+    should decode once into a local list.
+    """
+    __slots__ = ('_pool', '_ids')
+
+    def __init__(self, pool: TermPool, ids: memoryview):
+        self._pool = pool
+        self._ids = ids
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __iter__(self):
+        for term_id in self._ids:
+            yield self._pool.term(term_id)
+
+    def __contains__(self, term):
+        if not isinstance(term, str):
+            return False
+        term_id = self._pool.lookup(term)
+        if term_id < 0:
+            return False
+        # Ids within a topic are sorted, so bisect them as well
+        lo, hi = 0, len(self._ids)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._ids[mid] < term_id:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo < len(self._ids) and self._ids[lo] == term_id
+
+    def __reduce__(self):
+        return (_restore_term_set, (self._pool, self._ids.tobytes()))
+
+    def __repr__(self):
+        if not self._ids:
+            return 'set()'
+        return '{' + ', '.join(repr(term) for term in self) + '}'
+
+
+def _restore_term_set(pool, ids):
+    return TermSet(pool, _uint32s(ids))
+
+
+class TopicTermTable(Mapping):
+    """
+    Read-only {topic: TermSet} mapping
+    """
+    __slots__ = ('_topics',)
+
+    def __init__(self, topics: dict):
+        self._topics = topics
+
+    def __getitem__(self, topic):
+        return self._topics[topic]
+
+    def __iter__(self):
+        return iter(self._topics)
+
+    def __len__(self):
+        return len(self._topics)
+
+
+def _pack(topic_terms: dict):
+    """Flatten {topic: set_of_terms} into the arrays used by the table"""
+    # Topics that are not strings (e.g. NaN from a blank CSV cell) can never
+    # be looked up by predict_relevance, so they are left out
+    topic_terms = {topic: terms for topic, terms in topic_terms.items()
+                   if isinstance(topic, str)}
+    pool = TermPool.from_terms(term for terms in topic_terms.values() for term in terms)
+
+    ids = array('I')
+    spans = array('I', [0])
+    for terms in topic_terms.values():
+        ids.extend(sorted(pool.lookup(term) for term in terms))
+        spans.append(len(ids))
+    return pool, ids, spans, list(topic_terms)
+
+
+def _build_table(pool, ids, spans, topics):
+    return TopicTermTable({
+        sys.intern(topic): TermSet(pool, ids[spans[i]:spans[i + 1]])
+        for i, topic in enumerate(topics)
+    })
+
+
+def compact_topic_terms(topic_terms: dict) -> TopicTermTable:
+    """
+    Convert a {topic: set_of_terms} dict into an in-memory TopicTermTable.
+
+    Every distinct term is stored once across all topics, and per-topic
+    membership is a slice of one shared array of term ids.
+    """
+    pool, ids, spans, topics = _pack(topic_terms)
+    return _build_table(pool, _uint32s(ids), spans, topics)
+
+
+def save_topic_terms(topic_terms: dict, path):
+    """
+    Write the compact table to path, atomically replacing any existing file
+    """
+    pool, ids, spans, topics = _pack(topic_terms)
+    term_offsets = pool._offsets.tobytes()
+    term_blob = pool._blob
+    name_blob = b''.join(topic.encode('utf-8') for topic in topics)
+    name_offsets = array('I', [0])
+    for topic in topics:
+        name_offsets.append(name_offsets[-1] + len(topic.encode('utf-8')))
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(_HEADER.pack(_MAGIC, len(pool), len(ids), len(topics)))
+        for section in (term_offsets, ids.tobytes(), spans.tobytes(),
+                        name_offsets.tobytes(), term_blob, name_blob):
+            f.write(section)
+    os.replace(tmp_path, path)
+
+
+def load_topic_terms(path) -> TopicTermTable:
+    """
+    Map a table written by save_topic_terms without copying it.
+
+    The term blob and id arrays stay in the page cache and are shared by
+    every process that maps the same file.
+    """
+    with open(path, 'rb') as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    magic, n_terms, n_ids, n_topics = _HEADER.unpack_from(mm, 0)
+    if magic != _MAGIC:
+        raise ValueError(f"Not a topic terms table for this platform: {path}")
+
+    view = memoryview(mm)
+    pos = _HEADER.size
+
+    def take(count):
+        nonlocal pos
+        section = view[pos:pos + count * 4].cast('I')
+        pos += count * 4
+        return section
+
+    term_offsets = take(n_terms + 1)
+    ids = take(n_ids)
+    spans = take(n_topics + 1)
+    name_offsets = take(n_topics + 1)
+
+    pool = TermPool(mm, term_offsets, base=pos)
+    name_base = pos + term_offsets[-1]
+    topics = [mm[name_base + name_offsets[i]:name_base + name_offsets[i + 1]].decode('utf-8')
+              for i in range(n_topics)]
+    return _build_table(pool, ids, spans, topics)
+
+
+if __name__ == "__main__":
+    # Build step for low-memory serving: python topic_terms.py DATASET_CSV OUTPUT
+    if len(sys.argv) != 3:
+        sys.exit("usage: python topic_terms.py DATASET_CSV OUTPUT")
+    save_topic_terms(generate_topic_terms(sys.argv[1]), sys.argv[2])
+    print(f"Saved topic terms table to {os.path.abspath(sys.argv[2])}")
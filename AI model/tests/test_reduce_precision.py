@@ -0,0 +1,49 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "model"))
+
+try:
+    import torch  # noqa: F401
+    import transformers  # noqa: F401
+except ImportError:
+    torch = None
+
+DATASET = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "utils", "dataset.csv")
+
+
+@unittest.skipIf(torch is None, "torch and transformers are required")
+class ReducePrecisionTest(unittest.TestCase):
+    def setUp(self):
+        import reduce_precision
+        self.rp = reduce_precision
+
+    def test_only_float_serving_dtypes_are_accepted(self):
+        for name in ("float32", "float16", "bfloat16"):
+            self.assertEqual(self.rp.torch_dtype(name), getattr(torch, name))
+        for name in ("int8", "uint8", "float64", "bool", "nonsense"):
+            with self.assertRaises(ValueError):
+                self.rp.torch_dtype(name)
+
+    def test_validation_rows_limit(self):
+        self.assertEqual(self.rp.validation_rows(DATASET, 0), [])
+        self.assertEqual(self.rp.validation_rows(DATASET, -5), [])
+        self.assertEqual(len(self.rp.validation_rows(DATASET, 10)), 10)
+
+    def test_failed_check_is_a_problem(self):
+        check = {"dtype": "bfloat16", "samples": 0,
+                 "error": "no validation rows to compare against float32"}
+        self.assertEqual(self.rp.precision_problem(check, 0.02, 0, 1.5), check["error"])
+
+    def test_check_limits(self):
+        check = {"dtype": "bfloat16", "samples": 10, "max_drift": 0.01, "flips": 0,
+                 "float32_seconds": 2.0, "reduced_seconds": 1.0}
+        self.assertIsNone(self.rp.precision_problem(check, 0.02, 0, 1.5))
+        self.assertIsNotNone(self.rp.precision_problem(dict(check, max_drift=0.05), 0.02, 0, 1.5))
+        self.assertIsNotNone(self.rp.precision_problem(dict(check, flips=1), 0.02, 0, 1.5))
+        self.assertIsNotNone(self.rp.precision_problem(dict(check, reduced_seconds=4.0), 0.02, 0, 1.5))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import os
+import pickle
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "model"))
+
+from topic_terms import (  # noqa: E402
+    TermPool,
+    compact_topic_terms,
+    load_topic_terms,
+    save_topic_terms,
+)
+
+TOPIC_TERMS = {
+    "Biology": {"cell", "dna", "cell biology", "café"},
+    "Physics": {"atom", "cell", "naïve model"},
+    "Empty Topic": set(),
+    float("nan"): {"ignored"},
+}
+
+
+class TermPoolTest(unittest.TestCase):
+    def setUp(self):
+        self.pool = TermPool.from_terms(["cell", "atom", "café", "naïve model", "cell"])
+
+    def test_lookup_round_trips_every_term(self):
+        self.assertEqual(len(self.pool), 4)
+        for term in ["cell", "atom", "café", "naïve model"]:
+            self.assertEqual(self.pool.term(self.pool.lookup(term)), term)
+
+    def test_lookup_missing_terms(self):
+        for term in ["", "cel", "cells", "cafe", "zzz", "a"]:
+            self.assertEqual(self.pool.lookup(term), -1)
+
+
+class TermSetTest(unittest.TestCase):
+    def setUp(self):
+        self.table = compact_topic_terms(TOPIC_TERMS)
+
+    def test_contains_non_ascii_terms(self):
+        self.assertIn("café", self.table["Biology"])
+        self.assertIn("naïve model", self.table["Physics"])
+        self.assertNotIn("cafe", self.table["Biology"])
+
+    def test_term_in_pool_but_not_in_topic(self):
+        self.assertNotIn("atom", self.table["Biology"])
+        self.assertNotIn("dna", self.table["Physics"])
+        self.assertIn("cell", self.table["Physics"])
+
+    def test_empty_topic(self):
+        empty = self.table["Empty Topic"]
+        self.assertEqual(len(empty), 0)
+        self.assertNotIn("cell", empty)
+        self.assertEqual(list(empty), [])
+        self.assertEqual(repr(empty), "set()")
+
+    def test_iteration_matches_source_terms(self):
+        self.assertEqual(set(self.table["Biology"]), TOPIC_TERMS["Biology"])
+
+    def test_non_str_topics_are_skipped(self):
+        self.assertEqual(set(self.table), {"Biology", "Physics", "Empty Topic"})
+        self.assertEqual(self.table.get("Chemistry", set()), set())
+
+    def test_pickle_round_trip(self):
+        restored = pickle.loads(pickle.dumps(self.table))
+        self.assertEqual(set(restored["Biology"]), TOPIC_TERMS["Biology"])
+        self.assertNotIn("atom", restored["Biology"])
+
+
+class SavedTableTest(unittest.TestCase):
+    def test_save_and_map(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "topic_terms.bin")
+            save_topic_terms(TOPIC_TERMS, path)
+            table = load_topic_terms(path)
+
+            self.assertEqual(set(table), {"Biology", "Physics", "Empty Topic"})
+            self.assertEqual(set(table["Physics"]), TOPIC_TERMS["Physics"])
+            self.assertIn("café", table["Biology"])
+            self.assertNotIn("atom", table["Biology"])
+            self.assertEqual(len(table["Empty Topic"]), 0)
+
+            restored = pickle.loads(pickle.dumps(table))
+            self.assertEqual(set(restored["Biology"]), TOPIC_TERMS["Biology"])
+            del table, restored
+
+
+if __name__ == "__main__":
+    unittest.main()